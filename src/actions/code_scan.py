@@ -8,7 +8,7 @@ from typing import Any
 from agents import Runner, custom_span
 from github import Github
 
-from src.constants import CUSTOM_PROMPT, GITHUB_TOKEN, MAX_TURNS, MODEL
+from src.constants import CUSTOM_PROMPT, GITHUB_PER_PAGE, GITHUB_TOKEN, MAX_TURNS, MODEL
 from src.context.github_context import GithubContext
 from src.github_agents.code_scan_agent import create_code_scan_agent
 
@@ -48,7 +48,7 @@ class CodeScanAction:
                 with custom_span("Run code scan"):
                     context = GithubContext(
                         github_event=self.event,
-                        github_client=Github(GITHUB_TOKEN),
+                        github_client=Github(GITHUB_TOKEN, per_page=GITHUB_PER_PAGE),
                     )
                     result = await Runner.run(
                         starting_agent=self.agent,
@@ -8,7 +8,7 @@ from typing import Any
 from agents import Runner, custom_span
 from github import Github
 
-from src.constants import CUSTOM_PROMPT, GITHUB_TOKEN, MAX_TURNS, MODEL
+from src.constants import CUSTOM_PROMPT, GITHUB_PER_PAGE, GITHUB_TOKEN, MAX_TURNS, MODEL
 from src.context.github_context import GithubContext
 from src.github_agents.issue_analyze_agent import create_issue_analyze_agent
 
@@ -52,7 +52,7 @@ class IssueAnalyzeAction:
 
                     context = GithubContext(
                         github_event=self.event,
-                        github_client=Github(GITHUB_TOKEN),
+                        github_client=Github(GITHUB_TOKEN, per_page=GITHUB_PER_PAGE),
                     )
                     result = await Runner.run(
                         starting_agent=self.agent,
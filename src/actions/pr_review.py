@@ -4,7 +4,7 @@ from typing import Any
 from agents import Agent, Runner, custom_span
 from github import Github
 
-from src.constants import CUSTOM_PROMPT, GITHUB_TOKEN, MAX_TURNS, MODEL
+from src.constants import CUSTOM_PROMPT, GITHUB_PER_PAGE, GITHUB_TOKEN, MAX_TURNS, MODEL
 from src.context.github_context import GithubContext
 from src.github_agents.pr_review_agent import create_pr_review_agent
 
@@ -43,7 +43,7 @@ class PRReviewAction:
                 with custom_span("Run PR review"):
                     context = GithubContext(
                         github_event=self.event,
-                        github_client=Github(GITHUB_TOKEN),
+                        github_client=Github(GITHUB_TOKEN, per_page=GITHUB_PER_PAGE),
                     )
                     input_message = f"Pull request review for {repo_name}#{pr_number}"
                     result = await Runner.run(
@@ -11,3 +11,10 @@ LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
 GITHUB_EVENT_PATH = os.environ.get("GITHUB_EVENT_PATH")
 
 MAX_TURNS = int(os.environ.get("MAX_TURNS", 30))
+
+# Largest page size the GitHub REST API accepts for paginated endpoints
+GITHUB_PER_PAGE = 100
+
+# GitHub calls a single run may have in flight at once; GitHub's secondary rate limits
+# penalise concurrent requests made with one token
+GITHUB_MAX_CONCURRENT_CALLS = 4
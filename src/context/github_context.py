@@ -1,7 +1,15 @@
+import threading
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager, nullcontext
 from typing import Any
 
 from github import Github
-from pydantic import BaseModel, ConfigDict
+from github.Issue import Issue
+from github.PullRequest import PullRequest
+from github.Repository import Repository
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+from src.constants import GITHUB_MAX_CONCURRENT_CALLS
 
 
 class GithubContext(BaseModel):
@@ -9,3 +17,80 @@ class GithubContext(BaseModel):
 
     github_event: dict[str, Any]
     github_client: Github
+
+    _repos: dict[str, Repository] = PrivateAttr(default_factory=dict)
+    _cache: dict[Hashable, Any] = PrivateAttr(default_factory=dict)
+    _call_slots: threading.BoundedSemaphore = PrivateAttr(
+        default_factory=lambda: threading.BoundedSemaphore(GITHUB_MAX_CONCURRENT_CALLS)
+    )
+    _write_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    # Guards _repos, _cache and _generation, which tools share across worker threads
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _generation: int = PrivateAttr(default=0)
+
+    @contextmanager
+    def github_calls(self, *, write: bool = False) -> Iterator[None]:
+        """Hold one of the run's slots for GitHub calls; writes also run one at a time.
+
+        Tools run in worker threads, and PyGithub's request spacing does not hold across
+        threads, so this is what bounds the requests a run has in flight. Blocks that hold a
+        slot must not wait on other blocks that need one.
+        """
+        with self._write_lock if write else nullcontext(), self._call_slots:
+            yield
+
+    def get_repo(self, full_name: str) -> Repository:
+        """Return a lazy handle for ``full_name``, reused until ``clear_cache``.
+
+        Lazy handles do not request the repository until one of its attributes is read.
+        """
+        with self._lock:
+            repo = self._repos.get(full_name)
+            if repo is None:
+                repo = self._repos[full_name] = self.github_client.get_repo(full_name, lazy=True)
+        return repo
+
+    def get_pull(self, full_name: str, number: int) -> PullRequest:
+        """Return pull request ``number`` of ``full_name``, cached until ``clear_cache``."""
+        return self.cached(
+            ("pull", full_name, number), lambda: self.get_repo(full_name).get_pull(number)
+        )
+
+    def get_issue(self, full_name: str, number: int) -> Issue:
+        """Return issue ``number`` of ``full_name``, cached until ``clear_cache``."""
+        return self.cached(
+            ("issue", full_name, number), lambda: self.get_repo(full_name).get_issue(number)
+        )
+
+    def cached[T](self, key: Hashable, fetch: Callable[[], T]) -> T:
+        """Return the value cached under ``key``, calling ``fetch`` to populate it on a miss.
+
+        The context lives for a single action run, so entries never need to expire on their own.
+        A value fetched while ``clear_cache`` ran may predate a write, so it is returned to this
+        caller but not stored.
+        """
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            generation = self._generation
+        value = fetch()
+        with self._lock:
+            if generation == self._generation:
+                self._cache[key] = value
+        return value
+
+    def evict(self, key: Hashable) -> None:
+        """Drop the value cached under ``key``, if any."""
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear_cache(self) -> None:
+        """Drop every cached GitHub read, e.g. after a tool wrote to GitHub.
+
+        Repository handles are dropped too: once completed, PyGithub never refetches them, so
+        they would keep reporting counts from before the write.
+        """
+        with self._lock:
+            self._generation += 1
+            self._repos.clear()
+            self._cache.clear()
@@ -2,11 +2,17 @@
 GitHub tools implemented as function tools for OpenAI Agents SDK.
 """
 
+import asyncio
+import functools
+import itertools
 import logging
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any, NotRequired, TypedDict
+from typing import Any, Concatenate, NotRequired, TypedDict
 
 import github
+import requests
 from agents import RunContextWrapper, function_tool
 
 from src.context.github_context import GithubContext
@@ -14,9 +20,73 @@ from src.context.github_context import GithubContext
 logger = logging.getLogger("github-tools")
 
 
+def _run_in_thread[**P, R](func: Callable[P, R]) -> Callable[P, Coroutine[Any, Any, R]]:
+    """Run a blocking PyGithub tool body in a worker thread.
+
+    The agents SDK awaits all tool calls of a turn concurrently, so tool bodies must not
+    block the event loop for their GitHub requests to overlap.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
+
+
+def _cached[**P, R](
+    func: Callable[Concatenate[RunContextWrapper[GithubContext], P], R],
+) -> Callable[Concatenate[RunContextWrapper[GithubContext], P], R]:
+    """Serve repeated read-only tool calls with identical arguments from the run's cache.
+
+    Tools that write to GitHub must call ``GithubContext.clear_cache`` so later reads
+    observe their changes. Error results are not kept, so a transient failure such as a
+    5xx or a rate limit is retried on the next call.
+    """
+
+    @functools.wraps(func)
+    def wrapper(context: RunContextWrapper[GithubContext], *args: P.args, **kwargs: P.kwargs) -> R:
+        key = (func.__name__, *args, *sorted(kwargs.items()))
+        result = context.context.cached(key, lambda: func(context, *args, **kwargs))
+        if isinstance(result, dict) and result.get("type") == "error":
+            context.context.evict(key)
+        return result
+
+    return wrapper
+
+
 # Pull Request Tools
+def _github_calls[**P, R](
+    *, write: bool = False
+) -> Callable[
+    [Callable[Concatenate[RunContextWrapper[GithubContext], P], R]],
+    Callable[Concatenate[RunContextWrapper[GithubContext], P], R],
+]:
+    """Run the tool body in one of the run's GitHub call slots, see ``GithubContext.github_calls``.
+
+    Tools that write to GitHub pass ``write=True`` so their writes never overlap.
+    """
+
+    def decorator(
+        func: Callable[Concatenate[RunContextWrapper[GithubContext], P], R],
+    ) -> Callable[Concatenate[RunContextWrapper[GithubContext], P], R]:
+        @functools.wraps(func)
+        def wrapper(
+            context: RunContextWrapper[GithubContext], *args: P.args, **kwargs: P.kwargs
+        ) -> R:
+            with context.context.github_calls(write=write):
+                return func(context, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 @function_tool
-async def get_pull_request(
+@_run_in_thread
+@_cached
+@_github_calls()
+def get_pull_request(
     context: RunContextWrapper[GithubContext], repo: str, pr_number: int
 ) -> dict[str, Any]:
     """Get detailed information about a pull request.
@@ -29,8 +99,7 @@ async def get_pull_request(
         Dictionary with pull request details including title, body, state, commits, etc.
     """
     logger.info(f"Tool call: get_pull_request repo: {repo}, pr_number: {pr_number}")
-    repo_obj = context.context.github_client.get_repo(repo)
-    pr = repo_obj.get_pull(pr_number)
+    pr = context.context.get_pull(repo, pr_number)
 
     return {
         "number": pr.number,
@@ -76,7 +145,10 @@ async def get_pull_request(
 
 
 @function_tool
-async def get_pull_request_files(
+@_run_in_thread
+@_cached
+@_github_calls()
+def get_pull_request_files(
     context: RunContextWrapper[GithubContext], repo: str, pr_number: int
 ) -> list[dict[str, Any]]:
     """Get files changed in a pull request.
@@ -89,33 +161,29 @@ async def get_pull_request_files(
         List of dictionaries with file details including filename, status, changes, etc.
     """
     logger.info(f"Tool call: get_pull_request_files repo: {repo}, pr_number: {pr_number}")
-    repo_obj = context.context.github_client.get_repo(repo)
-    pr = repo_obj.get_pull(pr_number)
-
-    files = []
-    for file in pr.get_files():
-        files.append(
-            {
-                "filename": file.filename,
-                "status": file.status,
-                "additions": file.additions,
-                "deletions": file.deletions,
-                "changes": file.changes,
-                "blob_url": file.blob_url,
-                "raw_url": file.raw_url,
-                "patch": file.patch if hasattr(file, "patch") else None,
-                "previous_filename": (
-                    file.previous_filename if hasattr(file, "previous_filename") else None
-                ),
-                "sha": file.sha if hasattr(file, "sha") else None,
-            }
-        )
+    pr = context.context.get_pull(repo, pr_number)
 
-    return files
+    return [
+        {
+            "filename": file.filename,
+            "status": file.status,
+            "additions": file.additions,
+            "deletions": file.deletions,
+            "changes": file.changes,
+            "blob_url": file.blob_url,
+            "raw_url": file.raw_url,
+            "patch": getattr(file, "patch", None),
+            "previous_filename": getattr(file, "previous_filename", None),
+            "sha": getattr(file, "sha", None),
+        }
+        for file in pr.get_files()
+    ]
 
 
 @function_tool
-async def update_or_create_pr_comment(
+@_run_in_thread
+@_github_calls(write=True)
+def update_or_create_pr_comment(
     context: RunContextWrapper[GithubContext],
     repo: str,
     pr_number: int,
@@ -141,20 +209,18 @@ async def update_or_create_pr_comment(
         body,
         header_marker,
     )
-    repo_obj = context.context.github_client.get_repo(repo)
-    pr = repo_obj.get_pull(pr_number)
-    comments = list(pr.get_issue_comments())
-
-    # Find existing AI review comment
+    pr = context.context.get_pull(repo, pr_number)
+    # Find existing AI review comment, fetching further pages only until it is found
     existing_comment = None
-    for comment in comments:
-        if comment.body.startswith(header_marker):
+    for comment in pr.get_issue_comments():
+        if comment.body and comment.body.startswith(header_marker):
             existing_comment = comment
             break
 
     # Update existing comment or create new one
     if existing_comment:
         existing_comment.edit(body)
+        context.context.clear_cache()
         return {
             "id": existing_comment.id,
             "url": existing_comment.html_url,
@@ -163,6 +229,7 @@ async def update_or_create_pr_comment(
     else:
         # No existing comment found, create a new one
         new_comment = pr.create_issue_comment(body)
+        context.context.clear_cache()
         return {
             "id": new_comment.id,
             "url": new_comment.html_url,
@@ -171,9 +238,10 @@ async def update_or_create_pr_comment(
 
 
 @function_tool
-async def get_repository_info(
-    context: RunContextWrapper[GithubContext], repo: str
-) -> dict[str, Any]:
+@_run_in_thread
+@_cached
+@_github_calls()
+def get_repository_info(context: RunContextWrapper[GithubContext], repo: str) -> dict[str, Any]:
     """Get basic information about a repository.
 
     Args:
@@ -183,7 +251,7 @@ async def get_repository_info(
         Dictionary with repository details including name, description, language, stars, etc.
     """
     logger.info(f"Tool call: get_repository repo: {repo}")
-    repo_obj = context.context.github_client.get_repo(repo)
+    repo_obj = context.context.get_repo(repo)
 
     return {
         "name": repo_obj.name,
@@ -202,7 +270,10 @@ async def get_repository_info(
 
 
 @function_tool
-async def get_issue(
+@_run_in_thread
+@_cached
+@_github_calls()
+def get_issue(
     context: RunContextWrapper[GithubContext], repo: str, issue_number: int
 ) -> dict[str, Any]:
     """Get detailed information about an issue.
@@ -215,8 +286,7 @@ async def get_issue(
         Dictionary with issue details including title, body, state, comments, labels, etc.
     """
     logger.info(f"Tool call: get_issue repo: {repo}, issue_number: {issue_number}")
-    repo_obj = context.context.github_client.get_repo(repo)
-    issue = repo_obj.get_issue(issue_number)
+    issue = context.context.get_issue(repo, issue_number)
 
     return {
         "number": issue.number,
@@ -233,7 +303,9 @@ async def get_issue(
 
 
 @function_tool
-async def add_issue_comment(
+@_run_in_thread
+@_github_calls(write=True)
+def add_issue_comment(
     context: RunContextWrapper[GithubContext],
     repo: str,
     issue_number: int,
@@ -255,9 +327,9 @@ async def add_issue_comment(
         issue_number,
         body,
     )
-    repo_obj = context.context.github_client.get_repo(repo)
-    issue = repo_obj.get_issue(issue_number)
+    issue = context.context.get_issue(repo, issue_number)
     comment = issue.create_comment(body)
+    context.context.clear_cache()
     return {
         "id": comment.id,
         "url": comment.html_url,
@@ -265,7 +337,9 @@ async def add_issue_comment(
 
 
 @function_tool
-async def update_or_create_issue_comment(
+@_run_in_thread
+@_github_calls(write=True)
+def update_or_create_issue_comment(
     context: RunContextWrapper[GithubContext],
     repo: str,
     issue_number: int,
@@ -291,19 +365,17 @@ async def update_or_create_issue_comment(
         body,
         header_marker,
     )
-    repo_obj = context.context.github_client.get_repo(repo)
-    issue = repo_obj.get_issue(issue_number)
-    comments = list(issue.get_comments())
-
+    issue = context.context.get_issue(repo, issue_number)
     existing_comment = None
-    for comment in comments:
-        if comment.body.startswith(header_marker):
+    for comment in issue.get_comments():
+        if comment.body and comment.body.startswith(header_marker):
             existing_comment = comment
             break
 
     # Update existing comment or create new one
     if existing_comment:
         existing_comment.edit(body)
+        context.context.clear_cache()
         return {
             "id": existing_comment.id,
             "url": existing_comment.html_url,
@@ -312,6 +384,7 @@ async def update_or_create_issue_comment(
     else:
         # No existing comment found, create a new one
         new_comment = issue.create_comment(body)
+        context.context.clear_cache()
         return {
             "id": new_comment.id,
             "url": new_comment.html_url,
@@ -320,7 +393,10 @@ async def update_or_create_issue_comment(
 
 
 @function_tool
-async def get_repository_file_content(
+@_run_in_thread
+@_cached
+@_github_calls()
+def get_repository_file_content(
     context: RunContextWrapper[GithubContext],
     repo: str,
     path: str,
@@ -334,10 +410,11 @@ async def get_repository_file_content(
         ref: The name of the commit/branch/tag, defaults to the default branch
 
     Returns:
-        Dictionary with the content of the file/directory
+        Dictionary with the content of the file, or the entries of the directory
+          (without their content)
     """
     logger.info(f"Tool call: get_repository_file_content repo: {repo}, path: {path}, ref: {ref}")
-    repo_obj = context.context.github_client.get_repo(repo)
+    repo_obj = context.context.get_repo(repo)
     try:
         if ref is None:
             file_content = repo_obj.get_contents(path)
@@ -347,10 +424,11 @@ async def get_repository_file_content(
         if isinstance(file_content, list):
             return {
                 "type": "directory",
+                # Entries of a directory listing carry no content; decoding it would fetch
+                # every file individually, so callers request the files they need instead.
                 "files": [
                     {
                         "name": file.name,
-                        "content": file.decoded_content.decode("utf-8"),
                         "path": file.path,
                         "type": file.type,
                         "size": file.size,
@@ -382,7 +460,10 @@ async def get_repository_file_content(
 
 
 @function_tool
-async def list_repository_files(
+@_run_in_thread
+@_cached
+@_github_calls()
+def list_repository_files(
     context: RunContextWrapper[GithubContext],
     repo: str,
     path: str,
@@ -405,7 +486,7 @@ async def list_repository_files(
         path,
         ref,
     )
-    repo_obj = context.context.github_client.get_repo(repo)
+    repo_obj = context.context.get_repo(repo)
     if ref is not None:
         files = repo_obj.get_contents(path, ref=ref)
     else:
@@ -443,7 +524,9 @@ async def list_repository_files(
 
 
 @function_tool
-async def search_code(
+@_run_in_thread
+@_github_calls()
+def search_code(
     context: RunContextWrapper[GithubContext],
     query: str,
     repo: str,
@@ -479,9 +562,8 @@ async def search_code(
 
 
 @function_tool
-async def get_repository_stats(
-    context: RunContextWrapper[GithubContext], repo: str
-) -> dict[str, Any]:
+@_run_in_thread
+def get_repository_stats(context: RunContextWrapper[GithubContext], repo: str) -> dict[str, Any]:
     """Get statistical information about a repository.
 
     Args:
@@ -491,53 +573,75 @@ async def get_repository_stats(
         Dictionary with repository statistics including forks, stars, commit activity, etc.
     """
     logger.info(f"Tool call: get_repository_stats repo: {repo}")
-    repo_obj = context.context.github_client.get_repo(repo)
+    repo_obj = context.context.get_repo(repo)
+
+    def github_call[T](fetch: Callable[[], T]) -> T:
+        with context.context.github_calls():
+            return fetch()
+
+    # The endpoints below are independent of each other and of the repository itself, which
+    # this thread fetches in the meantime, so request them concurrently. Each request takes
+    # its own call slot, and this thread holds none while it waits for the others.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        open_pull_requests = executor.submit(
+            github_call, lambda: repo_obj.get_pulls(state="open").totalCount
+        )
+        commit_activity = executor.submit(github_call, repo_obj.get_stats_commit_activity)
+        code_frequency = executor.submit(github_call, repo_obj.get_stats_code_frequency)
+
+        with context.context.github_calls():
+            stats = {
+                "name": repo_obj.name,
+                "full_name": repo_obj.full_name,
+                "forks": repo_obj.forks_count,
+                "stars": repo_obj.stargazers_count,
+                "watchers": repo_obj.watchers_count,
+                "open_issues": repo_obj.open_issues_count,
+                "network_count": repo_obj.network_count,
+                "subscribers_count": repo_obj.subscribers_count,
+                "size": repo_obj.size,
+            }
+        stats["open_pull_requests"] = open_pull_requests.result()
 
-    stats = {
-        "name": repo_obj.name,
-        "full_name": repo_obj.full_name,
-        "forks": repo_obj.forks_count,
-        "stars": repo_obj.stargazers_count,
-        "watchers": repo_obj.watchers_count,
-        "open_issues": repo_obj.open_issues_count,
-        "network_count": repo_obj.network_count,
-        "subscribers_count": repo_obj.subscribers_count,
-        "size": repo_obj.size,
-        "open_pull_requests": len(list(repo_obj.get_pulls(state="open"))),
-    }
+        try:
+            # These could potentially fail or time out; PyGithub does not wrap transport errors
+            # such as timeouts or the RetryError raised once its retries on 5xx run out
+            activities = commit_activity.result()
+            frequencies = code_frequency.result()
 
-    try:
-        # These could potentially fail or timeout
-        stats["commit_activity"] = (
-            [
+            # PyGithub already waits out HTTP 202 while GitHub computes the statistics; None
+            # means an empty response, i.e. a repository without any commits
+            stats["commit_activity"] = [
                 {
                     "week": activity.week,
                     "total": activity.total,
                     "days": activity.days,
                 }
-                for activity in repo_obj.get_stats_commit_activity() or []
+                for activity in activities or []
             ]
-            if repo_obj.get_stats_commit_activity() is not None
-            else []
-        )
 
-        stats["code_frequency"] = [
-            {
-                "week": freq.week,
-                "additions": freq.additions,
-                "deletions": freq.deletions,
-            }
-            for freq in (repo_obj.get_stats_code_frequency() or [])
-        ]
-    except Exception:
-        stats["commit_activity"] = "Stats unavailable"
-        stats["code_frequency"] = "Stats unavailable"
+            stats["code_frequency"] = [
+                {
+                    "week": freq.week,
+                    "additions": freq.additions,
+                    "deletions": freq.deletions,
+                }
+                for freq in frequencies or []
+            ]
+        except github.RateLimitExceededException:
+            # PyGithub has already waited and retried; report the limit instead of hiding it
+            raise
+        except (github.GithubException, requests.RequestException):
+            stats["commit_activity"] = "Stats unavailable"
+            stats["code_frequency"] = "Stats unavailable"
 
     return stats
 
 
 @function_tool
-async def create_issue(
+@_run_in_thread
+@_github_calls(write=True)
+def create_issue(
     context: RunContextWrapper[GithubContext],
     repo: str,
     title: str,
@@ -558,9 +662,10 @@ async def create_issue(
     logger.info(
         f"Tool call: create_issue repo: {repo}, title: {title}, body: {body}, labels: {labels}"
     )
-    repo_obj = context.context.github_client.get_repo(repo)
+    repo_obj = context.context.get_repo(repo)
     issue_labels = labels or []
     issue = repo_obj.create_issue(title=title, body=body, labels=issue_labels)
+    context.context.clear_cache()
 
     return {
         "number": issue.number,
@@ -586,7 +691,9 @@ class ReviewComment(TypedDict):
 
 
 @function_tool
-async def create_pull_request_review(
+@_run_in_thread
+@_github_calls(write=True)
+def create_pull_request_review(
     context: RunContextWrapper[GithubContext],
     repo: str,
     pr_number: int,
@@ -633,8 +740,7 @@ async def create_pull_request_review(
         body,
         event,
     )
-    repo_obj = context.context.github_client.get_repo(repo)
-    pr = repo_obj.get_pull(pr_number)
+    pr = context.context.get_pull(repo, pr_number)
 
     review_body = body
     if review_comments is None:
@@ -646,6 +752,7 @@ async def create_pull_request_review(
         review = pr.create_review(
             body=review_body, event=event.value, comments=review_comments_list
         )
+    context.context.clear_cache()
 
     return {
         "id": review.id,
@@ -655,24 +762,43 @@ async def create_pull_request_review(
 
 
 @function_tool
-async def list_issue_comments(
+@_run_in_thread
+@_github_calls()
+def list_issue_comments(
     context: RunContextWrapper[GithubContext],
     repo: str,
     issue_number: int,
+    limit: int = 50,
 ) -> list[dict[str, Any]]:
-    """List all comments on an issue.
+    """List the most recent comments on an issue, oldest first.
 
     Args:
         repo: Repository name with owner (e.g., 'owner/repo')
         issue_number: Issue number
+        limit: Maximum number of comments to return, counted from the newest one
 
     Returns:
         List of dictionaries with comment details including id, body, user, and timestamps
     """
-    logger.info(f"Tool call: list_issue_comments repo: {repo}, issue_number: {issue_number}")
-    repo_obj = context.context.github_client.get_repo(repo)
-    issue = repo_obj.get_issue(issue_number)
-    comments = issue.get_comments()
+    logger.info(
+        "Tool call: list_issue_comments repo: %s, issue_number: %s, limit: %s",
+        repo,
+        issue_number,
+        limit,
+    )
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+    issue = context.context.get_issue(repo, issue_number)
+    all_comments = issue.get_comments()
+    # Most threads fit in the first page, which a single request returns
+    comments = all_comments.get_page(0)
+    if len(comments) < context.context.github_client.per_page:
+        comments = comments[-limit:]
+    else:
+        # Walk the comments newest first so islice stops PyGithub from requesting older pages
+        # than needed, then restore chronological order
+        comments = list(itertools.islice(all_comments.reversed, limit))
+        comments.reverse()
 
     return [
         {
@@ -687,7 +813,9 @@ async def list_issue_comments(
 
 
 @function_tool
-async def add_labels_to_issue(
+@_run_in_thread
+@_github_calls(write=True)
+def add_labels_to_issue(
     context: RunContextWrapper[GithubContext],
     repo: str,
     issue_number: int,
@@ -709,14 +837,16 @@ async def add_labels_to_issue(
         issue_number,
         labels,
     )
-    repo_obj = context.context.github_client.get_repo(repo)
-    issue = repo_obj.get_issue(issue_number)
+    issue = context.context.get_issue(repo, issue_number)
     issue.add_to_labels(*labels)
+    context.context.clear_cache()
     return {"success": True}
 
 
 @function_tool
-async def list_issue_labels(
+@_run_in_thread
+@_github_calls()
+def list_issue_labels(
     context: RunContextWrapper[GithubContext],
     repo: str,
     issue_number: int,
@@ -731,6 +861,5 @@ async def list_issue_labels(
         List of label names on the issue
     """
     logger.info(f"Tool call: list_issue_labels repo: {repo}, issue_number: {issue_number}")
-    repo_obj = context.context.github_client.get_repo(repo)
-    issue = repo_obj.get_issue(issue_number)
+    issue = context.context.get_issue(repo, issue_number)
     return [label.name for label in issue.labels]
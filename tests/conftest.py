@@ -1,7 +1,10 @@
 import json
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from github import Github
+
+from src.constants import GITHUB_PER_PAGE
 
 
 @pytest.fixture
@@ -58,12 +61,26 @@ def mock_issue_event():
 @pytest.fixture
 def mock_github_client():
     """Return a mock Github client."""
-    client = MagicMock()
+    client = MagicMock(spec=Github)
+    client.per_page = GITHUB_PER_PAGE
     repo = MagicMock()
     client.get_repo.return_value = repo
     return client
 
 
+@pytest.fixture(scope="session")
+def _shared_runner_run():
+    """Build the ``Runner.run`` AsyncMock once per session."""
+    return AsyncMock()
+
+
+@pytest.fixture
+def runner_run_mock(_shared_runner_run):
+    """Return the shared ``Runner.run`` mock, reset for the current test."""
+    _shared_runner_run.reset_mock(return_value=True, side_effect=True)
+    return _shared_runner_run
+
+
 @pytest.fixture(scope="session")
 def event_file(tmpdir_factory):
     """Create a temporary event file for testing."""
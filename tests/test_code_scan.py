@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from pydantic import ValidationError
@@ -176,6 +176,8 @@ def test_code_scan_init(mock_create_agent, mock_repo_event):
 @patch("src.actions.code_scan.GithubContext")
 @patch("src.actions.code_scan.Runner")
 @patch("src.actions.code_scan.create_code_scan_agent")
+@patch("src.actions.code_scan.GITHUB_TOKEN", "mock-token")
+@patch("src.actions.code_scan.MAX_TURNS", 30)
 async def test_code_scan_run(
     mock_create_agent,
     mock_runner,
@@ -184,12 +186,9 @@ async def test_code_scan_run(
     mock_logger,
     mock_repo_event,
     mock_scan_result,
-    monkeypatch,
+    runner_run_mock,
 ):
     """Test CodeScanAction.run method."""
-    monkeypatch.setenv("GITHUB_TOKEN", "mock-token")
-    monkeypatch.setenv("MAX_TURNS", "30")
-
     # Setup mocks
     mock_agent = MagicMock()
     mock_create_agent.return_value = mock_agent
@@ -200,14 +199,15 @@ async def test_code_scan_run(
     mock_context_instance = MagicMock()
     mock_github_context.return_value = mock_context_instance
 
-    mock_runner.run = AsyncMock(return_value=mock_scan_result)
+    runner_run_mock.return_value = mock_scan_result
+    mock_runner.run = runner_run_mock
 
     # Create and run the action
     action = CodeScanAction(mock_repo_event)
     await action.run()
 
     # Verify the correct methods were called with the right arguments
-    mock_github.assert_called_once()
+    mock_github.assert_called_once_with("mock-token", per_page=100)
     mock_github_context.assert_called_once_with(
         github_event=mock_repo_event, github_client=mock_github_instance
     )
@@ -217,6 +217,7 @@ async def test_code_scan_run(
     assert call_args["starting_agent"] == mock_agent
     assert call_args["input"] == "Please scan the repository: test-owner/test-repo\n"
     assert call_args["context"] == mock_context_instance
+    assert call_args["max_turns"] == 30
 
 
 @pytest.mark.asyncio
@@ -249,6 +250,7 @@ async def test_code_scan_run_agent_exception(
     mock_github,
     mock_logger,
     mock_repo_event,
+    runner_run_mock,
     monkeypatch,
 ):
     """Test CodeScanAction.run with exception in Runner.run."""
@@ -266,7 +268,8 @@ async def test_code_scan_run_agent_exception(
 
     # Simulate error in runner
     error_message = "Test runner error"
-    mock_runner.run = AsyncMock(side_effect=Exception(error_message))
+    runner_run_mock.side_effect = Exception(error_message)
+    mock_runner.run = runner_run_mock
 
     # Create action
     action = CodeScanAction(mock_repo_event)
@@ -0,0 +1,409 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import github
+import pytest
+import requests
+from agents import FunctionTool
+
+from src.constants import GITHUB_MAX_CONCURRENT_CALLS, GITHUB_PER_PAGE
+from src.context.github_context import GithubContext
+from src.tools import _TOOL_REGISTRY, execute_tool, get_tool_by_name
+
+# Tool descriptions are static, so lowercase them once instead of once per test case.
+_DESCRIPTIONS_LOWER = {name: tool.description.lower() for name, tool in _TOOL_REGISTRY.items()}
+
+# Read-only PyGithub File stand-ins shared by every test that lists PR files.
+_PR_FILES = tuple(
+    SimpleNamespace(
+        filename=filename,
+        status=status,
+        additions=additions,
+        deletions=deletions,
+        changes=additions + deletions,
+        blob_url=f"https://github.com/test-owner/test-repo/blob/abc123/{filename}",
+        raw_url=f"https://github.com/test-owner/test-repo/raw/abc123/{filename}",
+        patch=f"@@ -1 +1 @@ {filename}",
+        previous_filename=None,
+        sha=f"sha-{filename}",
+    )
+    for filename, status, additions, deletions in [
+        ("main.py", "modified", 7, 3),
+        ("README.md", "modified", 5, 0),
+        ("tests/test_utils.py", "added", 8, 0),
+        ("script.js", "removed", 0, 15),
+    ]
+)
+
+
+@pytest.fixture
+def github_context(mock_github_client, mock_pr_event):
+    """GithubContext wrapping the mocked Github client."""
+    return GithubContext(github_event=mock_pr_event, github_client=mock_github_client)
+
+
+# Keyword expected in each tool's description and its required parameters. Tool schemas are
+# strict, so parameters with defaults are required too (the model passes null for them).
+_TOOL_SCHEMAS = {
+    "get_pull_request": ("pull request", {"repo", "pr_number"}),
+    "get_pull_request_files": ("pull request", {"repo", "pr_number"}),
+    "update_or_create_pr_comment": (
+        "pull request",
+        {"repo", "pr_number", "body", "header_marker"},
+    ),
+    "get_repository_info": ("repository", {"repo"}),
+    "create_pull_request_review": (
+        "pull request",
+        {"repo", "pr_number", "body", "event", "review_comments"},
+    ),
+    "list_issue_comments": ("issue", {"repo", "issue_number", "limit"}),
+    "add_labels_to_issue": ("issue", {"repo", "issue_number", "labels"}),
+    "add_issue_comment": ("issue", {"repo", "issue_number", "body"}),
+    "list_issue_labels": ("issue", {"repo", "issue_number"}),
+    "get_repository_file_content": ("repository", {"repo", "path", "ref"}),
+    "search_code": ("repository", {"query", "repo"}),
+    "get_issue": ("issue", {"repo", "issue_number"}),
+    "update_or_create_issue_comment": (
+        "issue",
+        {"repo", "issue_number", "body", "header_marker"},
+    ),
+    "get_repository_stats": ("repository", {"repo"}),
+    "create_issue": ("issue", {"repo", "title", "body", "labels"}),
+    "list_repository_files": ("repository", {"repo", "path", "ref"}),
+}
+
+
+def test_tool_schema_table_covers_registry():
+    """Test that every registered tool has an expected schema below."""
+    assert _TOOL_SCHEMAS.keys() == _TOOL_REGISTRY.keys()
+
+
+@pytest.mark.parametrize(
+    "tool_name,keyword,required_params",
+    [(name, keyword, required) for name, (keyword, required) in _TOOL_SCHEMAS.items()],
+)
+def test_tool_schema(tool_name, keyword, required_params):
+    """Test that each tool is registered with a matching description and parameters."""
+    tool = get_tool_by_name(tool_name)
+
+    assert isinstance(tool, FunctionTool)
+    assert tool.name == tool_name
+    assert keyword in _DESCRIPTIONS_LOWER[tool_name]
+    assert set(tool.params_json_schema["required"]) == required_params
+
+
+def test_get_tool_by_name_unknown():
+    """Test that unknown tool names are not resolved."""
+    assert get_tool_by_name("does_not_exist") is None
+
+
+@pytest.mark.asyncio
+async def test_get_pull_request_files(github_context, mock_github_client):
+    """Test that PR files are returned as plain dictionaries in API order."""
+    pr = mock_github_client.get_repo.return_value.get_pull.return_value
+    pr.get_files.return_value = _PR_FILES
+
+    result = await execute_tool(
+        "get_pull_request_files",
+        {"repo": "test-owner/test-repo", "pr_number": 123},
+        github_context,
+    )
+
+    assert [file["filename"] for file in result] == [file.filename for file in _PR_FILES]
+    assert result[0] == {
+        "filename": "main.py",
+        "status": "modified",
+        "additions": 7,
+        "deletions": 3,
+        "changes": 10,
+        "blob_url": "https://github.com/test-owner/test-repo/blob/abc123/main.py",
+        "raw_url": "https://github.com/test-owner/test-repo/raw/abc123/main.py",
+        "patch": "@@ -1 +1 @@ main.py",
+        "previous_filename": None,
+        "sha": "sha-main.py",
+    }
+    mock_github_client.get_repo.assert_called_once_with("test-owner/test-repo", lazy=True)
+    mock_github_client.get_repo.return_value.get_pull.assert_called_once_with(123)
+
+
+@pytest.mark.asyncio
+async def test_read_tools_are_cached_until_a_write(github_context, mock_github_client):
+    """Test that repeated reads hit the run cache and writes invalidate it."""
+    repo = mock_github_client.get_repo.return_value
+    params = {"repo": "test-owner/test-repo", "issue_number": 456}
+
+    first = await execute_tool("get_issue", params, github_context)
+    second = await execute_tool("get_issue", params, github_context)
+
+    assert first is second
+    repo.get_issue.assert_called_once_with(456)
+
+    await execute_tool("add_issue_comment", {**params, "body": "Thanks!"}, github_context)
+    await execute_tool("get_issue", params, github_context)
+
+    # The comment reuses the cached issue; the read after the write fetches it again.
+    assert repo.get_issue.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_read_racing_a_write_is_not_cached(github_context, mock_github_client):
+    """Test that a read fetched while a write clears the cache is not served afterwards."""
+    repo = mock_github_client.get_repo.return_value
+    fetching, written = threading.Event(), threading.Event()
+    before_write, after_write = MagicMock(title="before"), MagicMock(title="after")
+
+    def get_issue(number):
+        if not written.is_set():
+            fetching.set()
+            written.wait(timeout=5)
+            return before_write
+        return after_write
+
+    repo.get_issue.side_effect = get_issue
+    params = {"repo": "test-owner/test-repo", "issue_number": 456}
+
+    read = asyncio.create_task(execute_tool("get_issue", params, github_context))
+    await asyncio.to_thread(fetching.wait, 5)
+    await execute_tool(
+        "create_issue",
+        {"repo": "test-owner/test-repo", "title": "Bug", "body": "Details"},
+        github_context,
+    )
+    written.set()
+
+    assert (await read)["title"] == "before"
+    assert (await execute_tool("get_issue", params, github_context))["title"] == "after"
+    assert repo.get_issue.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_pull_request_handle_is_shared_between_tools(github_context, mock_github_client):
+    """Test that PR tools reuse one repository and pull request lookup per run."""
+    repo = mock_github_client.get_repo.return_value
+    repo.get_pull.return_value.get_files.return_value = _PR_FILES
+    params = {"repo": "test-owner/test-repo", "pr_number": 123}
+
+    await execute_tool("get_pull_request", params, github_context)
+    await execute_tool("get_pull_request_files", params, github_context)
+    await execute_tool("get_pull_request_files", params, github_context)
+
+    mock_github_client.get_repo.assert_called_once_with("test-owner/test-repo", lazy=True)
+    repo.get_pull.assert_called_once_with(123)
+    repo.get_pull.return_value.get_files.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_get_repository_file_content_directory(github_context, mock_github_client):
+    """Test that directory listings do not fetch the content of every entry."""
+    entries = [
+        SimpleNamespace(
+            name=name,
+            path=f"src/{name}",
+            type=entry_type,
+            size=size,
+            sha=f"sha-{name}",
+            url=f"https://api.github.com/repos/test-owner/test-repo/contents/src/{name}",
+            git_url=None,
+            html_url=None,
+            download_url=None,
+        )
+        for name, entry_type, size in [("main.py", "file", 120), ("tools", "dir", 0)]
+    ]
+    mock_github_client.get_repo.return_value.get_contents.return_value = entries
+
+    result = await execute_tool(
+        "get_repository_file_content",
+        {"repo": "test-owner/test-repo", "path": "src"},
+        github_context,
+    )
+
+    assert result["type"] == "directory"
+    assert [entry["path"] for entry in result["files"]] == ["src/main.py", "src/tools"]
+    assert all("content" not in entry for entry in result["files"])
+
+
+@pytest.mark.asyncio
+async def test_get_repository_stats(github_context, mock_github_client):
+    """Test that each statistics endpoint is requested once and empty stats are empty lists."""
+    repo = mock_github_client.get_repo.return_value
+    repo.get_pulls.return_value.totalCount = 4
+    repo.get_stats_commit_activity.return_value = [
+        SimpleNamespace(week="2025-03-09", total=3, days=[0, 1, 2, 0, 0, 0, 0])
+    ]
+    repo.get_stats_code_frequency.return_value = None
+
+    result = await execute_tool(
+        "get_repository_stats", {"repo": "test-owner/test-repo"}, github_context
+    )
+
+    assert result["open_pull_requests"] == 4
+    assert result["commit_activity"] == [
+        {"week": "2025-03-09", "total": 3, "days": [0, 1, 2, 0, 0, 0, 0]}
+    ]
+    assert result["code_frequency"] == []
+    repo.get_pulls.assert_called_once_with(state="open")
+    repo.get_stats_commit_activity.assert_called_once_with()
+    repo.get_stats_code_frequency.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_get_repository_stats_timeout(github_context, mock_github_client):
+    """Test that a timed out statistics request only marks the statistics as unavailable."""
+    repo = mock_github_client.get_repo.return_value
+    repo.get_pulls.return_value.totalCount = 4
+    repo.get_stats_commit_activity.side_effect = requests.exceptions.ReadTimeout()
+
+    result = await execute_tool(
+        "get_repository_stats", {"repo": "test-owner/test-repo"}, github_context
+    )
+
+    assert result["open_pull_requests"] == 4
+    assert result["commit_activity"] == "Stats unavailable"
+    assert result["code_frequency"] == "Stats unavailable"
+
+
+@pytest.mark.parametrize(
+    "comment_count,expected_ids,expected_consumed",
+    [(3, [2, 3], []), (150, [149, 150], [150, 149])],
+    ids=["single-page", "multiple-pages"],
+)
+@pytest.mark.asyncio
+async def test_list_issue_comments_limit(
+    github_context, mock_github_client, comment_count, expected_ids, expected_consumed
+):
+    """Test that only the most recent comments are returned, oldest first.
+
+    A thread that fits in the first page is served by that page alone; longer threads are
+    walked newest first and only as far as the limit.
+    """
+    comments = [MagicMock(id=comment_id) for comment_id in range(1, comment_count + 1)]
+    consumed = []
+
+    def paginate_newest_first():
+        for comment in reversed(comments):
+            consumed.append(comment.id)
+            yield comment
+
+    all_comments = mock_github_client.get_repo.return_value.get_issue.return_value.get_comments
+    all_comments.return_value.get_page.return_value = comments[:GITHUB_PER_PAGE]
+    all_comments.return_value.reversed = paginate_newest_first()
+
+    result = await execute_tool(
+        "list_issue_comments",
+        {"repo": "test-owner/test-repo", "issue_number": 456, "limit": 2},
+        github_context,
+    )
+
+    assert [comment["id"] for comment in result] == expected_ids
+    assert consumed == expected_consumed
+    all_comments.return_value.get_page.assert_called_once_with(0)
+
+
+@pytest.mark.asyncio
+async def test_list_issue_comments_rejects_invalid_limit(github_context, mock_github_client):
+    """Test that a limit below 1 is reported to the agent before any comment is requested."""
+    result = await execute_tool(
+        "list_issue_comments",
+        {"repo": "test-owner/test-repo", "issue_number": 456, "limit": 0},
+        github_context,
+    )
+
+    assert "limit must be at least 1" in result
+    mock_github_client.get_repo.return_value.get_issue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_error_results_are_not_cached(github_context, mock_github_client):
+    """Test that a failed read is requested again instead of being served from the cache."""
+    repo = mock_github_client.get_repo.return_value
+    repo.get_contents.side_effect = [
+        github.GithubException(502, {"message": "Bad Gateway"}),
+        SimpleNamespace(
+            type="file",
+            decoded_content=b"print('hello')\n",
+            path="main.py",
+            size=15,
+            sha="sha-main.py",
+            url=None,
+            git_url=None,
+            html_url=None,
+            download_url=None,
+        ),
+    ]
+    params = {"repo": "test-owner/test-repo", "path": "main.py"}
+
+    first = await execute_tool("get_repository_file_content", params, github_context)
+    second = await execute_tool("get_repository_file_content", params, github_context)
+
+    assert first["type"] == "error"
+    assert second["content"] == "print('hello')\n"
+    assert repo.get_contents.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_repository_handle_is_refreshed_after_a_write(github_context, mock_github_client):
+    """Test that repository attributes read after a write come from a fresh handle."""
+    stale, fresh = MagicMock(open_issues_count=1), MagicMock(open_issues_count=2)
+    mock_github_client.get_repo.side_effect = [stale, fresh]
+    params = {"repo": "test-owner/test-repo"}
+    issue = {**params, "title": "Bug", "body": "Details"}
+
+    before = await execute_tool("get_repository_info", params, github_context)
+    await execute_tool("create_issue", issue, github_context)
+    after = await execute_tool("get_repository_info", params, github_context)
+
+    assert before["open_issues"] == 1
+    assert after["open_issues"] == 2
+    stale.create_issue.assert_called_once()
+
+
+def _track_concurrency(in_flight, peaks, result=None):
+    """Side effect recording the peak number of overlapping calls into ``peaks``."""
+    lock = threading.Lock()
+
+    def call(*args, **kwargs):
+        with lock:
+            in_flight.append(None)
+            peaks.append(len(in_flight))
+        time.sleep(0.02)
+        with lock:
+            in_flight.pop()
+        return result
+
+    return call
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tool_calls_are_capped(github_context, mock_github_client):
+    """Test that concurrent reads stay within the call slots and writes never overlap."""
+    repo = mock_github_client.get_repo.return_value
+    read_peaks, write_peaks = [], []
+    repo.get_issue.side_effect = _track_concurrency([], read_peaks, MagicMock())
+    repo.get_issue.return_value.create_comment = MagicMock(
+        side_effect=_track_concurrency([], write_peaks, MagicMock())
+    )
+    # get_issue is cached per issue, so give every read and write its own issue number
+    reads = [
+        execute_tool(
+            "get_issue", {"repo": "test-owner/test-repo", "issue_number": n}, github_context
+        )
+        for n in range(GITHUB_MAX_CONCURRENT_CALLS * 2)
+    ]
+    await asyncio.gather(*reads)
+
+    repo.get_issue.side_effect = None
+    writes = [
+        execute_tool(
+            "add_issue_comment",
+            {"repo": "test-owner/test-repo", "issue_number": 1, "body": f"comment {n}"},
+            github_context,
+        )
+        for n in range(3)
+    ]
+    await asyncio.gather(*writes)
+
+    assert 1 < max(read_peaks) <= GITHUB_MAX_CONCURRENT_CALLS
+    assert max(write_peaks) == 1
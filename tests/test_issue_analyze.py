@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -51,6 +51,7 @@ async def test_issue_analyze_run(
     mock_logger,
     mock_event,
     mock_result,
+    runner_run_mock,
 ):
     """Test IssueAnalyzeAction.run method."""
     # Setup mocks
@@ -63,14 +64,15 @@ async def test_issue_analyze_run(
     mock_context_instance = MagicMock()
     mock_github_context.return_value = mock_context_instance
 
-    mock_runner.run = AsyncMock(return_value=mock_result)
+    runner_run_mock.return_value = mock_result
+    mock_runner.run = runner_run_mock
 
     # Create and run the action
     action = IssueAnalyzeAction(mock_event)
     await action.run()
 
     # Verify the correct methods were called with the right arguments
-    mock_github.assert_called_once_with("mock-token")
+    mock_github.assert_called_once_with("mock-token", per_page=100)
     mock_github_context.assert_called_once_with(
         github_event=mock_event, github_client=mock_github_instance
     )
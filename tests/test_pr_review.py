@@ -1,17 +1,22 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+import copy
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+from agents import Agent
 
 from src.actions.pr_review import PRReviewAction
 
+# Sample PR event; the fixture hands each test its own copy.
+_PR_EVENT = {
+    "pull_request": {"number": 123},
+    "repository": {"full_name": "test-owner/test-repo"},
+}
+
 
 @pytest.fixture
 def mock_event():
     """Sample PR event data for testing."""
-    return {
-        "pull_request": {"number": 123},
-        "repository": {"full_name": "test-owner/test-repo"},
-    }
+    return copy.deepcopy(_PR_EVENT)
 
 
 @pytest.fixture
@@ -22,16 +27,24 @@ def mock_result():
     return result
 
 
-@patch("src.actions.pr_review.create_pr_review_agent")
-def test_pr_review_init(mock_create_agent, mock_event):
-    """Test PRReviewAction initialization."""
-    mock_agent = MagicMock()
-    mock_create_agent.return_value = mock_agent
+@pytest.fixture
+def mock_create_agent():
+    """Patch the PR review agent factory so it returns a mock agent."""
+    with patch("src.actions.pr_review.create_pr_review_agent") as factory:
+        factory.return_value = Mock(spec=Agent)
+        yield factory
+
+
+@pytest.fixture
+def action(mock_create_agent, mock_event):
+    """PRReviewAction built from the sample event with a mocked agent."""
+    return PRReviewAction(mock_event)
 
-    action = PRReviewAction(mock_event)
 
+def test_pr_review_init(action, mock_create_agent, mock_event):
+    """Test PRReviewAction initialization."""
     assert action.event == mock_event
-    assert action.agent == mock_agent
+    assert action.agent == mock_create_agent.return_value
     mock_create_agent.assert_called_once()
 
 
@@ -41,67 +54,67 @@ def test_pr_review_init(mock_create_agent, mock_event):
 @patch("src.actions.pr_review.Github")
 @patch("src.actions.pr_review.GithubContext")
 @patch("src.actions.pr_review.Runner")
-@patch("src.actions.pr_review.create_pr_review_agent")
+@patch("src.actions.pr_review.GITHUB_TOKEN", "mock-token")
+@patch("src.actions.pr_review.MAX_TURNS", 30)
 async def test_pr_review_run(
-    mock_create_agent,
     mock_runner,
     mock_github_context,
     mock_github,
     mock_logger,
     mock_exit,
+    action,
+    mock_create_agent,
     mock_event,
     mock_result,
-    monkeypatch,
+    runner_run_mock,
 ):
     """Test PRReviewAction.run method."""
-    monkeypatch.setenv("GITHUB_TOKEN", "mock-token")
-    monkeypatch.setenv("MAX_TURNS", "30")
-
     # Setup mocks
-    mock_agent = MagicMock()
-    mock_create_agent.return_value = mock_agent
-
     mock_github_instance = MagicMock()
     mock_github.return_value = mock_github_instance
 
     mock_context_instance = MagicMock()
     mock_github_context.return_value = mock_context_instance
 
-    mock_runner.run = AsyncMock(return_value=mock_result)
+    runner_run_mock.return_value = mock_result
+    mock_runner.run = runner_run_mock
 
-    # Create and run the action
-    action = PRReviewAction(mock_event)
     await action.run()
 
     # Verify the correct methods were called with the right arguments
-    mock_github.assert_called_once()
+    mock_github.assert_called_once_with("mock-token", per_page=100)
     mock_github_context.assert_called_once_with(
         github_event=mock_event, github_client=mock_github_instance
     )
 
     mock_runner.run.assert_called_once()
     call_args = mock_runner.run.call_args[1]
-    assert call_args["starting_agent"] == mock_agent
+    assert call_args["starting_agent"] == mock_create_agent.return_value
     assert call_args["input"] == "Pull request review for test-owner/test-repo#123"
     assert call_args["context"] == mock_context_instance
+    assert call_args["max_turns"] == 30
 
 
 @pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "event",
+    [
+        {"pull_request": {}, "repository": {"full_name": "test-owner/test-repo"}},
+        {"pull_request": {"number": 123}, "repository": {}},
+        {},
+    ],
+    ids=["missing-number", "missing-repository", "empty-event"],
+)
 @patch("sys.exit")
 @patch("src.actions.pr_review.logger")
-@patch("src.actions.pr_review.create_pr_review_agent")
-async def test_pr_review_run_missing_data(mock_create_agent, mock_logger, mock_exit):
+@patch("src.actions.pr_review.Runner")
+async def test_pr_review_run_missing_data(
+    mock_runner, mock_logger, mock_exit, mock_create_agent, event
+):
     """Test PRReviewAction.run with missing PR data."""
-    mock_agent = MagicMock()
-    mock_create_agent.return_value = mock_agent
-
-    # Create event with missing data
-    event = {
-        "pull_request": {},  # Missing number
-        "repository": {"full_name": "test-owner/test-repo"},
-    }
-
     action = PRReviewAction(event)
 
     with pytest.raises(ValueError, match="Missing required PR information"):
         await action.run()
+
+    assert mock_runner.run.call_count == 0